@@ -4,10 +4,13 @@
 
 """Test suite for the library."""
 
+import io
 import unittest
+import warnings
 
 import toml
 from toml._dotty import Dotty
+from toml._toml import Tokens
 
 TEST_FILE = "__test__.toml"
 
@@ -17,12 +20,13 @@ class Syntax(unittest.TestCase):
 
     CANT_PARSE = "Couldn't parse value"
 
+    # small incompatibility here
+    HAS_REGEX = hasattr(unittest.TestCase, "assertRaisesRegex")
+
     def syntax_error(self, file: str, message: str) -> None:
         """Check messages coming from syntax errors."""
-        # small incompatibility here
-        if hasattr(self, "assertRaisesRegex"):
-            with self.assertRaisesRegex(toml.TOMLError, message):
-                toml.loads(file)
+        if self.HAS_REGEX:
+            self.assertRaisesRegex(toml.TOMLError, message, toml.loads, file)
 
         else:
             with self.assertRaises(toml.TOMLError) as context_manager:
@@ -65,9 +69,18 @@ class Syntax(unittest.TestCase):
 
     def test_negative_values(self) -> None:
         """bin, oct and hex numbers can't be negative."""
-        self.syntax_error("foo = -0b10", "invalid")
-        self.syntax_error("foo = -0o10", "invalid")
-        self.syntax_error("foo = -0x10", "invalid")
+        for file in ("foo = -0b10", "foo = -0o10", "foo = -0x10"):
+            self.syntax_error(file, "invalid")
+
+    def test_malformed_array(self) -> None:
+        """Commas must separate elements, on flat and non-flat arrays alike."""
+        for file in ("foo = [1,,2]", "foo = [,]", "foo = ['a',,'b']"):
+            self.syntax_error(file, "Malformed array")
+
+    def test_redefine_value(self) -> None:
+        """Values can't be turned into tables."""
+        self.syntax_error("a.b = 1\n[a.b]", "already a value")
+        self.syntax_error("a = 1\na.b = 2", "already a value")
 
 
 class Issues(unittest.TestCase):
@@ -154,9 +167,120 @@ class Misc(unittest.TestCase):
 
     def test_dump_and_load(self) -> None:
         """Loading the dump of a TOML retrieves the original data."""
-        data = {"foo": "bar", "baz": {"foo": "bar"}}
+        data: dict = {"foo": "bar", "baz": {"foo": "bar"}}
+        self.assertEqual(toml.loads(toml.dumps(data)), Dotty(data))
+
+        # booleans are lowercase in TOML, also inside arrays
+        data = {"foo": True, "bar": [False, 1]}
+        self.assertEqual(toml.loads(toml.dumps(data)), Dotty(data))
+
+    def test_dump_long_key(self) -> None:
+        """Values with very long keys are still dumped before any table."""
+        data = {"sub": {"foo": "bar"}, "a" * 1001: 1}
         self.assertEqual(toml.loads(toml.dumps(data)), Dotty(data))
 
+    def test_load_matches_loads(self) -> None:
+        """Reading a file line by line gives the same result as the whole string."""
+        doc = (
+            "title = 'foo' # comment\n"
+            "\n"
+            "[owner]\n"
+            "name = 'bar'\n"
+            "tags = ['a', [1, 2]]\n"
+            "[owner.nested]\n"
+            "'quoted key' = 1.5\n"
+            "[other]\n"
+            "enabled = true\r\n"
+        )
+        self.assertEqual(toml.load(io.StringIO(doc)), toml.loads(doc))
+
+        with self.assertRaises(toml.TOMLError):
+            toml.load(io.StringIO("foo = 1\rbar = 2\n"))
+
+    def test_compare_other_types(self) -> None:
+        """Comparing against something that is not a Dotty is just not equal."""
+        data = Dotty({"foo": "bar"})
+        self.assertFalse(data == {"foo": "bar"})
+        self.assertFalse(data == None)  # noqa: E711
+        self.assertIn(data, [None, data])
+
+    def test_contains_through_value(self) -> None:
+        """A path going through a non-table value is just not there."""
+        data = Dotty({"x": "str", "y": {"z": 1}})
+        self.assertNotIn("x.y", data)
+        self.assertNotIn("y.z.w", data)
+        self.assertIn("y.z", data)
+
+    def test_problematic_keys_warn(self) -> None:
+        """Every document with problematic keys warns, clean ones dont."""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+
+            toml.loads("foo = 1")
+            self.assertEqual(len(caught), 0)
+
+            toml.loads("'foo.bar' = 1")
+            toml.loads("[table]\n'' = 1")
+            Dotty()["foo..bar"] = 1
+            self.assertEqual(len(caught), 3)
+
+    def test_escapes(self) -> None:
+        """Unicode escapes take 8 or 4 hex digits, anything else is kept as is."""
+        self.assertEqual(toml.loads('foo = "\\u00e9"')["foo"], "\u00e9")
+
+        # 8 digits would be out of range, falls back to 4 of them
+        self.assertEqual(toml.loads('foo = "\\u00e9abcd"')["foo"], "\u00e9abcd")
+
+        # too few digits (also at the end of input), signs, spaces or underscores
+        for escape in ("\\u12", "\\u+0e9", "\\x 41", "\\x_1"):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+
+                file = f'foo = "{escape}"'
+                self.assertEqual(toml.loads(file)["foo"], escape)
+                self.assertEqual(Tokens.escaped_char(escape[1:]), (escape[:2], 1))
+                self.assertEqual(len(caught), 2)
+
+    def test_trailing_comma(self) -> None:
+        """Arrays can be empty or end with a comma, with or without strings."""
+        self.assertEqual(
+            toml.loads("foo = [1, 2,]\nbar = []\nbaz = ['a', 'b',]"),
+            Dotty({"foo": [1, 2], "bar": [], "baz": ["a", "b"]}),
+        )
+
+    def test_set_under_non_dict(self) -> None:
+        """Nesting under an existing value (even None) fails, leaving it alone."""
+        data = Dotty({"foo": None})
+        with self.assertRaises(TypeError):
+            data["foo.bar"] = 1
+
+        self.assertEqual(data, Dotty({"foo": None}))
+
+    def test_nested_lists(self) -> None:
+        """Lists can be nested (without hitting any recursion limit)."""
+        self.assertEqual(
+            toml.loads("foo = [1, [2, ['3', [4]]], [], 5]"),
+            Dotty({"foo": [1, [2, ["3", [4]]], [], 5]}),
+        )
+
+        depth = 5000
+        data = toml.loads("foo = " + "[" * depth + "'bar'" + "]" * depth)
+
+        value = data["foo"]
+        for _ in range(depth - 1):
+            value = value[0]  # type: ignore[index]
+        self.assertEqual(value, ["bar"])
+
+    def test_crlf(self) -> None:
+        """Windows line endings are fine, a lone carriage return is not."""
+        self.assertEqual(
+            toml.loads("foo = 1\r\nbar = 2\r\n"),
+            Dotty({"foo": 1, "bar": 2}),
+        )
+
+        with self.assertRaises(toml.TOMLError):
+            toml.loads("foo = 1\rbar = 2")
+
 
 if __name__ == "__main__":
     unittest.main()
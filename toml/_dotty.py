@@ -18,6 +18,9 @@ class Dotty:
     _BASE = object()
     """Special id to return the base dict."""
 
+    _MISSING = object()
+    """Special id for keys not in a dict (None could be an actual value)."""
+
     def __init__(self, __data: dict | None = None) -> None:
         """Create a new instance, either empty or around existing data."""
         if __data is None:
@@ -54,21 +57,48 @@ class Dotty:
         if not isinstance(key, str):
             return [], key
 
-        *parts, last = key.split(".")
-        return parts, last
+        # nor keys without dots
+        i = key.rfind(".")
+        if i < 0:
+            return [], key
+
+        return key[:i].split("."), key[i + 1 :]
+
+    def walk(self, key: object) -> tuple[dict, object]:
+        """Descend to the table holding a key, without splitting it into a list.
+
+        >>> walk("foo")
+        >>> data, "foo"
+
+        >>> walk("foo.bar.baz")
+        >>> data["foo"]["bar"], "baz"
+        """
+        table = self.data
+
+        # dont try to split non-str keys
+        if not isinstance(key, str):
+            return table, key
+
+        start = 0
+        while True:
+            i = key.find(".", start)
+            if i < 0:
+                return table, key[start:]
+
+            table = table[key[start:i]]
+            start = i + 1
 
     def __getitem__(self, __key: object) -> object:
         """Syntactic sugar to get a nested item."""
         # special case, return base dict
-        if __key == self._BASE:
+        if __key is self._BASE:
             return self.data
 
-        keys, last = self.split(__key)
-
-        table = self.data
-        for k in keys:
-            table = table[k]
+        # leaf key, no need to walk
+        if not isinstance(__key, str) or "." not in __key:
+            return self.data[__key]
 
+        table, last = self.walk(__key)
         return table[last]
 
     @staticmethod
@@ -84,32 +114,51 @@ class Dotty:
                 warnings.warn(msg)  # noqa: B028  # CircuitPython has no stacklevel
                 return
 
-    def get_or_create_dict(self, parts: list[str]) -> dict:
-        """Get a nested dict from its "path", create parent(s) if needed."""
-        global_key = ""
-        table = self.data
+    def get_or_create_dict(self, parts: list[str], table: dict | None = None) -> dict:
+        """Get a nested dict from its "path", create parent(s) if needed.
+
+        Path is relative to `table`, or to the base dict if not given.
+        """
+        if table is None:
+            table = self.data
 
         for part in parts:
-            if not isinstance(table, dict):
-                msg = "Something went wrong on get_or_create_dict. This is not a dict."
-                raise TypeError(msg)
+            # single lookup, rather than checking `in` and then indexing
+            nxt = table.get(part, self._MISSING)
 
-            if part not in table:
-                global_key += "." + part
+            # create new dict
+            if nxt is self._MISSING:
+                new: dict = {}
+                table[part] = new
+                table = new
 
-                # create new dict
-                table[part] = {}
+            # existing entry, has to be a table to descend into it
+            elif isinstance(nxt, dict):
+                table = nxt
 
-            # update "location"
-            table = table[part]
+            else:
+                msg = "Something went wrong on get_or_create_dict. This is not a dict."
+                raise TypeError(msg)
 
         return table
 
     def __setitem__(self, __key: str, __value: object) -> None:
         """Syntactic sugar to set a nested item."""
+        # leaf key, no need to split
+        if not isinstance(__key, str) or "." not in __key:
+            # only possible problem is an empty key
+            if __key == "":
+                self.validate_keys(__key)
+
+            self.data[__key] = __value
+            return
+
         keys, last = self.split(__key)
 
-        self.validate_keys(last, *keys)
+        # parts can only be empty if there are leading/trailing/double dots
+        if __key[0] == "." or __key[-1] == "." or ".." in __key:
+            self.validate_keys(last, *keys)
+
         table = self.get_or_create_dict(keys)
 
         table[last] = __value
@@ -123,30 +172,51 @@ class Dotty:
         Apparently not too useful on CP
           > https://github.com/elpekenin/circuitpython_toml/issues/4
         """
-        if hasattr(self.data, __key):
+        try:
             return getattr(self.data, __key)
-
-        msg = f"'{self.__class__.__name__}' has no attribute '{__key}'."
-        raise AttributeError(msg)
+        except AttributeError:
+            msg = f"'{self.__class__.__name__}' has no attribute '{__key}'."
+            raise AttributeError(msg) from None
 
     def __eq__(self, __value: object) -> bool:
-        klass = self.__class__
-
-        if not isinstance(__value, klass):
-            msg = f"Comparation not implemented for {klass} and {type(__value)}."
-            raise TypeError(msg)
+        # let Python try the reflected operation, or fall back to identity
+        if not isinstance(__value, Dotty):
+            return NotImplemented
 
         return self.data == __value.data
 
     def __contains__(self, __key: object) -> bool:
-        try:
-            self.__getitem__(__key)
-        except KeyError:
-            return False
-        else:
+        # special case, base dict is always there
+        if __key is self._BASE:
             return True
 
+        table = self.data
+
+        # dont try to split non-str keys, nor leaf ones
+        if not isinstance(__key, str) or "." not in __key:
+            return __key in table
+
+        # same logic as walk(), but bailing out instead of raising
+        start = 0
+        while True:
+            i = __key.find(".", start)
+            part = __key[start:] if i < 0 else __key[start:i]
+
+            if not isinstance(table, dict) or part not in table:
+                return False
+
+            if i < 0:
+                return True
+
+            table = table[part]
+            start = i + 1
+
     def __delitem__(self, __key: object) -> None:
+        # leaf key, no parent table to clean up
+        if not isinstance(__key, str) or "." not in __key:
+            del self.data[__key]
+            return
+
         keys, last = self.split(__key)
 
         parent_table = None
@@ -10,7 +10,6 @@ This structure is a custom class (Dotty) around a regular dict, adding some conv
 from __future__ import annotations
 
 import warnings
-from io import StringIO
 
 from ._dotty import Dotty
 
@@ -21,7 +20,8 @@ except ImportError:
     pass
 
 if TYPE_CHECKING:
-    from collections.abc import Sized
+    from collections.abc import Iterable, Iterator, Sequence, Sized
+    from typing import ClassVar
 
 
 class TOMLError(Exception):
@@ -51,19 +51,55 @@ class Tokens:
         DQUOTE,
     )
 
-    ALL = (
+    # single-character tokens, sets for O(1) membership tests when scanning lines
+    CHARS: ClassVar[set[str]] = {
         OPENING_BRACKET,
         CLOSING_BRACKET,
         QUOTE,
         DQUOTE,
-        TRIPLE_QUOTE,
-        TRIPLE_DQUOTE,
         EQUAL_SIGN,
         COMMENT,
         COMMA,
         BACKSLASH,
+    }
+    QUOTE_CHARS: ClassVar[set[str]] = {QUOTE, DQUOTE}
+
+    # every token that needs ParsedLine's char-by-char scan, ie: all but "="
+    # no need for triple quotes, a single quote would be found first
+    NEEDS_SCAN = (
+        OPENING_BRACKET,
+        CLOSING_BRACKET,
+        QUOTE,
+        DQUOTE,
+        COMMENT,
+        COMMA,
+        BACKSLASH,
     )
 
+    ESCAPES: ClassVar[dict[str, str]] = {
+        "b": "\b",
+        "t": "\t",
+        "n": "\n",
+        "f": "\f",
+        "r": "\r",
+        "e": "\x1b",  # "\e" is not a thing
+        '"': '"',
+        "\\": "\\",
+    }
+    """Simple escape sequences, and the character they stand for."""
+
+    ESCAPE_WIDTHS: ClassVar[dict[str, tuple[int, ...]]] = {
+        "u": (8, 4),
+        "x": (2,),
+    }
+    """Escape sequences followed by an hex number, and how many digits it can have."""
+
+    HEX_DIGITS = "0123456789abcdefABCDEF"
+    """Characters allowed on the hex number of an escape sequence."""
+
+    MAX_CODEPOINT = 0x10FFFF
+    """Largest value `chr` accepts."""
+
     @staticmethod
     def escaped_char(string: str) -> tuple[str, int]:
         """See TOML's documentation for details, link below.
@@ -72,37 +108,28 @@ class Tokens:
 
         Returns replacement and how much to update the pointer.
         """
-        replacements = {
-            "b": "\b",
-            "t": "\t",
-            "n": "\n",
-            "f": "\f",
-            "r": "\r",
-            "e": "\x1b",  # "\e" is not a thing
-            '"': '"',
-            "\\": "\\",
-        }
-
         escaped = string[0]
 
-        replacement = replacements.get(escaped)
+        replacement = Tokens.ESCAPES.get(escaped)
         if replacement is not None:
             return replacement, 1
 
-        for specifier, width in (
-            ("u", 8),
-            ("u", 4),
-            ("x", 2),
-        ):
-            if escaped != specifier:
-                continue
-
-            try:
-                char = chr(int(string[1 : 1 + width], 16))
-            except ValueError:
+        # longest width first, as a shorter one could match just a prefix of it
+        # validate digits upfront, instead of relying on int() raising, because
+        # exceptions are slow (specially on CP) and a "\u" with 4 digits always
+        # failed on the first (8 digits) attempt
+        for width in Tokens.ESCAPE_WIDTHS.get(escaped, ()):
+            digits = string[1 : 1 + width]
+            if len(digits) != width:
                 continue
 
-            return char, 1 + width
+            for digit in digits:
+                if digit not in Tokens.HEX_DIGITS:
+                    break
+            else:
+                codepoint = int(digits, 16)
+                if codepoint <= Tokens.MAX_CODEPOINT:
+                    return chr(codepoint), 1 + width
 
         # TODO(elpekenin): should this raise instead?
         warnings.warn(f"Unknown/invalid escape sequence '\\{escaped}'")  # noqa: B028  # CircuitPython has no stacklevel
@@ -126,53 +153,96 @@ class ParsedLine:
     __repr__ = __str__
 
     def __init__(self, line: str) -> None:
-        self.line = ""
-        self.tokens = {t: [] for t in Tokens.ALL}
+        # lists are only created for tokens actually found, most lines have few
+        self.tokens = {}
+
+        # collect pieces and join them once, `str +=` is quadratic on CircuitPython
+        parts: list[str] = []
+        parts_length = 0
 
         keep_escape = False
 
         stripped = line.strip()
         length = len(stripped)
 
+        # simple lines (eg: `foo = 42`) can only have equal signs, find them
+        # with `str.find` instead of looping over every character in Python
+        for needs_scan in Tokens.NEEDS_SCAN:
+            if needs_scan in stripped:
+                break
+        else:
+            i = stripped.find(Tokens.EQUAL_SIGN)
+            while i >= 0:
+                self.add(Tokens.EQUAL_SIGN, i)
+                i = stripped.find(Tokens.EQUAL_SIGN, i + 1)
+
+            self.line = stripped
+            return
+
+        # plain characters are copied as slices of the line (one per run between
+        # strings) rather than appended one by one
+        run_start = 0
+
         i = 0
         while i < length:
             char = stripped[i]
 
-            # dont parse strings if we have an array
-            # the array-parsing logic will take care of that later
-            # and we dont want to do it twice
-            token, string, offset = Parser.string(stripped[i:], keep_escape=keep_escape)
-            if string:
+            # only a quote can open a string
+            if char in Tokens.QUOTE_CHARS:
+                # dont parse strings if we have an array
+                # the array-parsing logic will take care of that later
+                # and we dont want to do it twice
+                token, string, offset = Parser.string(
+                    stripped,
+                    i,
+                    keep_escape=keep_escape,
+                )
                 if token is None:
                     msg = "This should be unreachable."
                     raise RuntimeError(msg)
 
-                self.tokens[token].append(i)
-                self.tokens[token].append(i + offset)
+                self.add(token, i)
+                self.add(token, i + offset)
+
+                parts.append(stripped[run_start:i])
+                parts.append(string)
+                parts_length += i - run_start + len(string)
 
                 i += offset
-                self.line += string
+                run_start = i
 
                 continue
 
-            # upon finding a comment quit
-            if char == Tokens.COMMENT:
-                # clean trailing spaces
-                self.line = self.line.rstrip()
-                return
-
-            i += 1
-            self.line += char
+            if char in Tokens.CHARS:
+                # upon finding a comment quit
+                if char == Tokens.COMMENT:
+                    break
 
-            # store tokens' positions
-            if char in Tokens.ALL:
                 if char == Tokens.OPENING_BRACKET:
                     keep_escape = True
 
-                self.tokens[char].append(len(self.line) - 1)
+                # store tokens' positions, on the clean line
+                self.add(char, parts_length + i - run_start)
+
+            i += 1
+
+        # last run, up to the end of the line (or the comment)
+        parts.append(stripped[run_start:i])
 
         # clean trailing spaces
-        self.line = self.line.rstrip()
+        self.line = "".join(parts).rstrip()
+
+    def add(self, token: str, position: int) -> None:
+        """Store a position where a token was found."""
+        positions = self.tokens.get(token)
+        if positions is None:
+            self.tokens[token] = [position]
+        else:
+            positions.append(position)
+
+    def positions(self, token: str) -> Sequence[int]:
+        """Get the position(s) of a token, empty if not found on the line."""
+        return self.tokens.get(token, ())
 
     def is_empty(self) -> bool:
         """Whether this line contains anything."""
@@ -180,11 +250,11 @@ class ParsedLine:
 
     def key_value(self) -> tuple[str, str]:
         """Get the key and value on this line (ie: split on equal sign)."""
-        if len(self.tokens[Tokens.EQUAL_SIGN]) != 1:
+        if len(self.positions(Tokens.EQUAL_SIGN)) != 1:
             msg = "How did we end up on key_value with len(EQUAL) != 1."
             raise RuntimeError(msg)
 
-        split_at = self.tokens[Tokens.EQUAL_SIGN][0]
+        split_at = self.positions(Tokens.EQUAL_SIGN)[0]
         key = self.line[:split_at].strip()
         value = self.line[split_at + 1 :].strip()
 
@@ -194,14 +264,34 @@ class ParsedLine:
 class Parser:
     """Get Python values out of strings."""
 
+    INT_BASES: ClassVar[dict[str, int]] = {
+        "b": 2,
+        "o": 8,
+        "x": 16,
+    }
+    """Base specifier (after the leading 0) of non-decimal integers."""
+
+    FLOAT_LITERALS: ClassVar[dict[str, float]] = {
+        "inf": float("inf"),
+        "nan": float("nan"),
+    }
+    """Special floating point values."""
+
+    BOOL_LITERALS: ClassVar[dict[str, bool]] = {
+        "true": True,
+        "false": False,
+    }
+    """Boolean values."""
+
     @classmethod
     def string(
         cls,
         value: str,
+        start: int = 0,
         *,
         keep_escape: bool = False,
     ) -> tuple[str | None, str, int]:
-        """Find the next **quoted** string in the input.
+        """Find the next **quoted** string in the input, starting at `start`.
 
         Returns it and how much the cursor has been moved.
 
@@ -209,69 +299,67 @@ class Parser:
         >>> string("'''hello'world'''")
         >>> Tokens.TRIPLE_QUOTE, "hello'world", 17
 
+        Taking a start position (rather than a slice) saves copying the rest of
+        the line for every string on it.
+
         Keeping escape sequences is only used when we get into a list when
         initially scanning the raw line, because the code to parse list will
         also parse the string, and if we really interpret it twice, code breaks.
         """
-        quote_token = None
-        string = ""
-        i = 0
-
-        for token in Tokens.QUOTES:
-            sliced = value[i : i + len(token)]
-            # opening quote
-            if sliced == token and quote_token is None:
-                # store the string delimiter
-                quote_token = token
-
-                # the "clean" line should store single
-                # quotes, not triple, thus append just current char
-                string += token[0]
-
-                # store this token
-                i += len(token)
-
+        # not even a single quote, dont bother trying every (triple) quote
+        if value[start : start + 1] not in Tokens.QUOTE_CHARS:
+            return None, "", 0
+
+        # opening quote, startswith does not allocate a slice per candidate
+        for quote_token in Tokens.QUOTES:
+            if value.startswith(quote_token, start):
+                quote_length = len(quote_token)
                 break
 
         # quote token not found, just exit
         else:
-            return None, string, i
+            return None, "", 0
 
-        length = len(value)
-        while i < length:
-            char = value[i]
+        # the "clean" line should store single
+        # quotes, not triple, thus append just current char
+        quote_char = quote_token[0]
+        i = start + quote_length
 
-            if char == Tokens.BACKSLASH:
-                i += 1  # backslash itself
+        parts = [quote_char]
 
-                replacement, offset = Tokens.escaped_char(value[i:])
+        # jump from one escape sequence to the next with `str.find` (C-level scan)
+        # copying the plain text in between as a single slice
+        close = value.find(quote_token, i)
+        while close >= 0:
+            escape = value.find(Tokens.BACKSLASH, i, close)
 
-                if keep_escape:
-                    string += "\\" + value[i : i + offset]
-                else:
-                    string += replacement
-                i += offset
+            # no escape before the closing quote, we are done
+            if escape < 0:
+                parts.append(value[i:close])
+                parts.append(quote_char)
 
-                continue
+                return quote_token, "".join(parts), close + quote_length - start
 
-            # closing quote
-            sliced = value[i : i + len(quote_token)]
-            if sliced == quote_token:
-                string += quote_token[0]
+            parts.append(value[i:escape])
 
-                i += len(quote_token)
+            i = escape + 1  # backslash itself
 
-                return quote_token, string, i
+            # longest escape sequence is "u" and 8 hex digits, see Tokens.ESCAPE_WIDTHS
+            replacement, offset = Tokens.escaped_char(value[i : i + 9])
 
-            i += 1
-            string += char
+            if keep_escape:
+                parts.append("\\" + value[i : i + offset])
+            else:
+                parts.append(replacement)
+            i += offset
 
-        # if we get down here, check that we did not had not found an opening
-        if quote_token is not None:
-            msg = "String was open but not closed."
-            raise TOMLError(msg)
+            # escaped quote(s), look for the closing one again
+            if close < i:
+                close = value.find(quote_token, i)
 
-        return None, "", 0
+        # if we get down here, the string was opened but never closed
+        msg = "String was open but not closed."
+        raise TOMLError(msg)
 
     @classmethod
     def key(cls, key: str) -> list[str]:
@@ -284,36 +372,54 @@ class Parser:
         "foo.bar.baz" | ["foo.bar.baz"]
         "foo.bar".baz | ["foo.bar", "baz"]
         """
-        parts: list[str | None] = [None]
+        if Tokens.QUOTE in key or Tokens.DQUOTE in key:
+            return cls.quoted_key(key)
+
+        # no quotes => every dot is a separator, split in C rather than char by char
+        # spaces are not part of the key, and empty parts are dropped
+        path = []
+        for part in key.split("."):
+            clean = "".join(part.split())
+            if clean:
+                path.append(clean)
+
+        return path
+
+    @classmethod
+    def quoted_key(cls, key: str) -> list[str]:
+        """Slow path of `key`, walking it to find the quoted parts."""
+        # each part is a list of pieces, joined once at the end
+        parts: list[list[str] | None] = [None]
         length = len(key)
 
         i = 0
         while i < length:
-            _, string, offset = Parser.string(key[i:])
-            if string:
+            char = key[i]
+
+            if char in Tokens.QUOTE_CHARS:
+                _, string, offset = Parser.string(key, i)
                 i += offset
                 # NOTE: string is quoted, eg from a """hello"world"""
                 #       we get "hello\"world", stip head and trail quotes
                 #       but dont use .replace() as we might remove actual info
-                parts.append(string[1:-1])
+                parts.append([string[1:-1]])
                 continue
 
-            char = key[i]
             if char == ".":
                 parts.append(None)
             elif not char.isspace():
-                # if last part is empty (None), replace it
-                if parts[-1] is None:
-                    parts[-1] = ""
+                last = parts[-1]
 
-                # we know it will not be, based on context, but MyPy is not smart enough
-                if parts[-1] is not None:
-                    parts[-1] += char
+                # if last part is empty (None), replace it
+                if last is None:
+                    parts[-1] = [char]
+                else:
+                    last.append(char)
 
             i += 1
 
         # remove the (potential) empty strings that got added
-        return [part for part in parts if part is not None]
+        return ["".join(part) for part in parts if part is not None]
 
     @classmethod
     def try_int(cls, string: str) -> int | None:
@@ -326,11 +432,7 @@ class Parser:
             if string[1] == ".":
                 return None  # return cls.try_float(string) ??
 
-            base = {
-                "b": 2,
-                "o": 8,
-                "x": 16,
-            }.get(string[1], None)
+            base = cls.INT_BASES.get(string[1])
 
             if base is None:
                 msg = "Invalid number."
@@ -343,22 +445,23 @@ class Parser:
     @classmethod
     def try_float(cls, string: str) -> float | None:
         """Try and convert a string into an floating point number."""
-        literals = {"inf": float("inf"), "nan": float("nan")}
-
-        maybe_literal = literals.get(string)
+        maybe_literal = cls.FLOAT_LITERALS.get(string)
         if maybe_literal is not None:
             return maybe_literal
 
+        # split on the (first) dot and check each half, rather than count()'ing
+        # dots and isdigit()'ing a replace()'d copy of the whole string
+        integer, point, decimal = string.partition(".")
         if (
-            string.count(".") == 1
-            # if replacing a single dot with 0 yields a number, this was a float
-            and string.replace(".", "0").isdigit()
+            point
+            and (not integer or integer.isdigit())
+            and (not decimal or decimal.isdigit())
         ):
-            if string[0] == ".":
+            if not integer:
                 msg = "Leading point is invalid."
                 raise TOMLError(msg)
 
-            if string[-1] == ".":
+            if not decimal:
                 msg = "Trailing point is invalid."
                 raise TOMLError(msg)
 
@@ -367,8 +470,12 @@ class Parser:
         return None
 
     @classmethod
-    def try_number(cls, string: str) -> int | float | None:  # noqa: C901
+    def try_number(cls, string: str) -> int | float | None:  # noqa: C901, PLR0912
         """Try and convert a string into a number."""
+        # plain digits (most common case) cant have underscores nor sign
+        if string.isdigit():
+            return int(string)
+
         # numbers with underscores
         if string[0] == "_":
             msg = "Leading underscore is invalid."
@@ -387,12 +494,19 @@ class Parser:
                 msg = "Underscore next to point is invalid."
                 raise TOMLError(msg)
 
+            # no underscores left, checks above will be trivial on this call
             maybe_number = cls.try_number(string.replace("_", ""))
             if maybe_number is not None:
                 return maybe_number
 
-        # positive/negative sign
-        if string[0] in ("+", "-"):
+        # positive/negative sign(s), stripped in a loop rather than recursing
+        multiplier = 1
+        while string[0] in ("+", "-"):
+            # only reachable with underscores if they did not make a valid number
+            if string[1] == "_":
+                msg = "Leading underscore is invalid."
+                raise TOMLError(msg)
+
             if string[0] == string[1]:
                 msg = "Double sign is invalid."
                 raise TOMLError(msg)
@@ -401,30 +515,25 @@ class Parser:
                 msg = "Sign and base specifier is invalid."
                 raise TOMLError(msg)
 
-            maybe_number = cls.try_number(string[1:])
-            if maybe_number is not None:
-                multiplier = -1 if string[0] == "-" else 1
-                return multiplier * maybe_number
+            if string[0] == "-":
+                multiplier = -multiplier
+
+            string = string[1:]
 
         maybe_number = cls.try_int(string)
         if maybe_number is not None:
-            return maybe_number
+            return multiplier * maybe_number
 
-        maybe_number = cls.try_float(string)
-        if maybe_number is not None:
-            return maybe_number
+        maybe_float = cls.try_float(string)
+        if maybe_float is not None:
+            return multiplier * maybe_float
 
         return None
 
     @classmethod
     def try_bool(cls, string: str) -> bool | None:
         """Try and parse a literal value."""
-        literals = {
-            "true": True,
-            "false": False,
-        }
-
-        return literals.get(string)
+        return cls.BOOL_LITERALS.get(string)
 
     @classmethod
     def value(cls, string: str, line_info: ParsedLine | None = None) -> object:
@@ -432,26 +541,30 @@ class Parser:
 
         Note: line_info is only used when parsing lists
         """
+        first = string[0]
+        last = string[-1]
+
         # quoted string, has to be first, to prevent casting it
-        if Syntax.is_quoted(string):
+        if first == last and first in Tokens.QUOTE_CHARS:
             # remove quotes
             return string[1:-1]
 
-        maybe_number = cls.try_number(string)
-        if maybe_number is not None:
-            return maybe_number
-
+        # bool, single dict lookup (cheaper than all the number checks)
         maybe_bool = cls.try_bool(string)
         if maybe_bool is not None:
             return maybe_bool
 
+        maybe_number = cls.try_number(string)
+        if maybe_number is not None:
+            return maybe_number
+
         # array
-        if Syntax.is_in_brackets(string):
+        if first == Tokens.OPENING_BRACKET and last == Tokens.CLOSING_BRACKET:
             if line_info is None:
                 msg = "Array parsing without line info (WTF)."
                 raise TOMLError(msg)
 
-            start = line_info.tokens[Tokens.OPENING_BRACKET][0]
+            start = line_info.positions(Tokens.OPENING_BRACKET)[0]
             value, _ = cls.list(line_info.line, start + 1)
             return value
 
@@ -462,104 +575,235 @@ class Parser:
         )
         raise TOMLError(msg)
 
+    @classmethod
+    def flat_list(cls, line: str, start: int) -> tuple[list[object], int] | None:
+        """Parse a list with no strings nor nested lists, by splitting on commas.
+
+        Same return as `list`, or None if the list is not flat.
+        """
+        close = line.find(Tokens.CLOSING_BRACKET, start)
+        if close < 0:
+            return None
+
+        flat = line[start:close]
+        for token in (Tokens.OPENING_BRACKET, Tokens.QUOTE, Tokens.DQUOTE):
+            if token in flat:
+                return None
+
+        *items, last = flat.split(Tokens.COMMA)
+
+        elements: list[object] = []
+        for item in items:
+            stripped = item.strip()
+            if not stripped:
+                msg = "Malformed array, check out your commas."
+                raise TOMLError(msg)
+
+            elements.append(cls.value(stripped))
+
+        # trailing comma is fine
+        stripped = last.strip()
+        if stripped:
+            elements.append(cls.value(stripped))
+
+        return elements, close + 1
+
+    @classmethod
+    def list_element(
+        cls,
+        collected: list[str],
+        last_run: str,
+        elements: list[object],
+    ) -> bool:
+        """Parse the plain text collected for an element, if any, into `elements`.
+
+        Returns whether there was an element.
+        """
+        collected.append(last_run)
+        stripped = "".join(collected).strip()
+        if not stripped:
+            return False
+
+        elements.append(cls.value(stripped))
+        return True
+
     @classmethod
     def list(cls, line: str, start: int) -> tuple[list[object], int]:
         """Parse a list. Returns parsed list and where next element starts."""
+        # flat list without strings (eg: `[1, 2, 3]`), no need to walk it
+        flat = cls.flat_list(line, start)
+        if flat is not None:
+            return flat
+
         i = start
-        collected = ""
+        length = len(line)
         elements: list[object] = []
         parsed_since_last_comma = False
 
-        while i < len(line):
+        # outer lists while parsing a nested one, rather than recursing
+        # CircuitPython has a rather small limit on nested calls
+        stack: list[list[object]] = []
+
+        # plain text of the current element, copied as slices of the line
+        # (one per run between strings) rather than char by char
+        collected: list[str] = []
+        run_start = start
+
+        while i < length:
             char = line[i]
 
-            # handle strings
-            _, string, offset = cls.string(line[i:])
-            if string:
+            # handle strings, only a quote can open one
+            if char in Tokens.QUOTE_CHARS:
+                _, string, offset = cls.string(line, i)
                 elements.append(string[1:-1])
 
+                collected.append(line[run_start:i])
                 i += offset
+                run_start = i
                 parsed_since_last_comma = True
 
-            # stop when current list ends
-            elif char == Tokens.CLOSING_BRACKET:
-                stripped = collected.strip()
-                if stripped:
-                    elements.append(cls.value(stripped))
+            # nested list, parse it (unless flat) and update current position
+            elif char == Tokens.OPENING_BRACKET:
+                flat = cls.flat_list(line, i + 1)
+                if flat is not None:
+                    value, i = flat
+                    elements.append(value)
+                    parsed_since_last_comma = True
+                else:
+                    # added to its parent right away, filled in as we go
+                    inner: list[object] = []
+                    elements.append(inner)
+                    stack.append(elements)
+                    elements = inner
+                    i += 1
+                    parsed_since_last_comma = False
+
+                run_start = i
+                collected = []
 
-                return elements, i + 1
+            # end of element, parse what we had collected
+            elif char in (Tokens.COMMA, Tokens.CLOSING_BRACKET):
+                parsed = cls.list_element(collected, line[run_start:i], elements)
 
-            # parse list and update current position
-            elif char == Tokens.OPENING_BRACKET:
-                value, new_pos = cls.list(line, i + 1)
-                elements.append(value)
+                # current list ends, stop or get back to the outer one
+                if char == Tokens.CLOSING_BRACKET:
+                    if not stack:
+                        return elements, i + 1
 
-                i = new_pos
-                collected = ""
-                parsed_since_last_comma = True
+                    elements = stack.pop()
 
-            # parse the element we had collected
-            elif char == Tokens.COMMA:
-                stripped = collected.strip()
-                if stripped:
-                    elements.append(cls.value(stripped))
-                elif not parsed_since_last_comma:
+                elif not parsed and not parsed_since_last_comma:
                     msg = "Malformed array, check out your commas."
                     raise TOMLError(msg)
 
                 i += 1
-                collected = ""
-                parsed_since_last_comma = False
+                run_start = i
+                collected = []
+                # a closed list is an element of its parent
+                parsed_since_last_comma = char == Tokens.CLOSING_BRACKET
 
-            # collect another char
+            # plain char, will be sliced along with the rest of its run
             else:
                 i += 1
-                collected += char
 
-        # how do we get here?
-        return elements, i
+        # how do we get here? (unclosed list, return the outermost one)
+        return (stack[0] if stack else elements), i
 
     @classmethod
     def toml(cls, raw_file: str) -> Dotty:
         """Parse a whole TOML string."""
-        table_name: list[str] = []
-        data = Dotty()
+        # check the whole input at once, instead of scanning each line 5 times
+        Syntax.check_control_chars(raw_file)
 
-        for raw_line in raw_file.replace("\r\n", "\n").split("\n"):
-            #             null    lf     us      del     bs
-            for char in ("\x00", "\r", "\x1f", "\x7f", "\x08"):
-                if char in raw_line:
-                    char_ = repr(char)
-                    msg = f"Invalid control sequence {char_} found."
-                    raise TOMLError(msg)
+        return cls.toml_lines(cls.split_lines(raw_file))
 
-            parsed_line = ParsedLine(raw_line)
+    @staticmethod
+    def split_lines(string: str) -> Iterator[str]:
+        """Yield the lines of a string one at a time.
 
-            # empty line => nothing to be done
-            if parsed_line.is_empty():
-                continue
+        Unlike `str.split`, this does not keep a list with a copy of every line.
+        """
+        start = 0
+        while True:
+            end = string.find("\n", start)
+            if end < 0:
+                yield string[start:]
+                return
 
-            Syntax.check_or_raise(parsed_line)
+            yield string[start:end]
+            start = end + 1
 
-            # equal sign => assignment expresion
-            if Syntax.is_assignment(parsed_line):
-                key, value = parsed_line.key_value()
+    @staticmethod
+    def checked_lines(file: TextIO) -> Iterator[str]:
+        """Read a file line by line, checking each of them for control characters."""
+        for line in file:
+            Syntax.check_control_chars(line)
+            yield line
+
+    @classmethod
+    def toml_lines(cls, lines: Iterable[str]) -> Dotty:
+        """Parse TOML from (already validated) lines, consumed one at a time."""
+        data = Dotty()
+
+        # dict for the last [table] seen, so that assignments under it
+        # dont have to walk its path from the root every time
+        current_table = data.data
+
+        # bind the per-line helpers once, attribute lookups are slow (specially on CP)
+        parse_line = ParsedLine
+        check_or_raise = Syntax.check_or_raise
+        parse_key = cls.key
+        parse_value = cls.value
+        validate_keys = data.validate_keys
+        get_or_create_dict = data.get_or_create_dict
+
+        for raw_line in lines:
+            # blank or comment-only line => nothing to be done, dont even parse it
+            stripped = raw_line.strip()
+            if not stripped or stripped[0] == Tokens.COMMENT:
+                continue
 
-                *parts, last = cls.key(key)
-                parts = table_name + parts
+            parsed_line = parse_line(stripped)
 
-                data.validate_keys(last, *parts)
-                table = data.get_or_create_dict(parts)
+            # equal sign => assignment expresion (checks already look for it)
+            if check_or_raise(parsed_line):
+                key, value = parsed_line.key_value()
 
-                table[last] = cls.value(value, parsed_line)
+                *parts, last = parse_key(key)
+
+                # unquoted keys are split on every dot, dropping empty parts, thus
+                # only quoted ones can be problematic
+                # table's name was already validated when it got created
+                if Tokens.QUOTE in key or Tokens.DQUOTE in key:
+                    validate_keys(last, *parts)
+                table = current_table
+                if parts:
+                    try:
+                        table = get_or_create_dict(parts, current_table)
+                    except TypeError:
+                        msg = (
+                            f"Cant assign '{key}', part of its path is already a value."
+                        )
+                        raise TOMLError(msg) from None
+
+                table[last] = parse_value(value, parsed_line)
 
             # no equal sign => table assignment, ie: [table]
             else:
                 # remove "[" and "]", handle quotes/dots
-                table_name = cls.key(parsed_line.line[1:-1])
+                raw_name = parsed_line.line[1:-1]
+                table_name = parse_key(raw_name)
 
-                data.validate_keys(*table_name)
-                data.get_or_create_dict(table_name)
+                if Tokens.QUOTE in raw_name or Tokens.DQUOTE in raw_name:
+                    validate_keys(*table_name)
+
+                try:
+                    current_table = get_or_create_dict(table_name)
+                except TypeError:
+                    msg = (
+                        f"Cant redefine '{raw_name}' as a table, it is already a value."
+                    )
+                    raise TOMLError(msg) from None
 
         return data
 
@@ -568,47 +812,49 @@ class Syntax:
     """Tiny helpers for syntax."""
 
     @staticmethod
-    def check_or_raise(parsed: ParsedLine) -> None:
-        """Run some checks."""
-        is_assignment = Syntax.is_assignment(parsed)
-        is_table_setter = Syntax.is_in_brackets(parsed.line)
+    def check_control_chars(string: str) -> None:
+        """Make sure there are no forbidden control characters."""
+        #             null    lf     us      del     bs
+        for char in ("\x00", "\r", "\x1f", "\x7f", "\x08"):
+            if char in string:
+                # CRLF line endings are fine, they get strip()'ed with the line
+                # counting them avoids a replace()'d copy of the whole input
+                if char == "\r" and string.count("\r") == string.count("\r\n"):
+                    continue
+
+                char_ = repr(char)
+                msg = f"Invalid control sequence {char_} found."
+                raise TOMLError(msg)
+
+    @staticmethod
+    def check_or_raise(parsed: ParsedLine) -> bool:
+        """Run some checks. Returns whether the line is an assignment."""
+        equal_signs = parsed.positions(Tokens.EQUAL_SIGN)
+        line = parsed.line
+        is_table_setter = (
+            line[0] == Tokens.OPENING_BRACKET and line[-1] == Tokens.CLOSING_BRACKET
+        )
 
-        if not is_assignment and not is_table_setter:
+        if not equal_signs and not is_table_setter:
             msg = "Line has to contain either an assignment or table setter."
             raise TOMLError(msg)
 
-        if is_assignment:
+        if equal_signs:
             if is_table_setter:
                 msg = "Line cant be an assignment and table setter."
                 raise TOMLError(msg)
 
-            equal_sign = parsed.tokens[Tokens.EQUAL_SIGN][0]
-            if is_assignment and not len(parsed.line) > equal_sign + 1:
+            if not len(line) > equal_signs[0] + 1:
                 msg = "Invalid assignment, nothing after equal sign."
                 raise TOMLError(msg)
 
-        opening = parsed.tokens[Tokens.OPENING_BRACKET]
-        closing = parsed.tokens[Tokens.CLOSING_BRACKET]
+        opening = parsed.positions(Tokens.OPENING_BRACKET)
+        closing = parsed.positions(Tokens.CLOSING_BRACKET)
         if len(opening) != len(closing):
             msg = "Mismatched brackets."
             raise TOMLError(msg)
 
-    @staticmethod
-    def is_quoted(value: str) -> bool:
-        """Check if a string is quoted."""
-        return value[0] == value[-1] and value[0] in Tokens.QUOTES
-
-    @staticmethod
-    def is_assignment(parsed: ParsedLine) -> bool:
-        """Whether this line contains an assignment."""
-        return bool(parsed.tokens[Tokens.EQUAL_SIGN])
-
-    @staticmethod
-    def is_in_brackets(value: str) -> bool:
-        """Whether string starts with an opening bracket and ends with a closing one."""
-        return (
-            value[0] == Tokens.OPENING_BRACKET and value[-1] == Tokens.CLOSING_BRACKET
-        )
+        return bool(equal_signs)
 
 
 ##############
@@ -620,11 +866,11 @@ def loads(__str: str) -> Dotty:
 
 
 def load(__file: TextIO) -> Dotty:
-    """Parse TOML from a file-like."""
-    return loads(__file.read())
+    """Parse TOML from a file-like, reading it line by line to save memory."""
+    return Parser.toml_lines(Parser.checked_lines(__file))
 
 
-def dumps(__data: Dotty | dict) -> str:
+def dumps(__data: Dotty | dict) -> str:  # noqa: C901
     """Write a (dotty) dict as TOML into a string."""
     if not isinstance(__data, (Dotty, dict)):
         msg = "dumping is only implemented for dict-like objects."
@@ -634,46 +880,66 @@ def dumps(__data: Dotty | dict) -> str:
     if isinstance(__data, Dotty):
         __data = __data.data
 
-    def order(key_value: tuple[Sized, object]) -> int:
-        """Dump basic keys before nested tables."""
-        key, value = key_value
-        return 1000 if isinstance(value, dict) else len(key)
-
-    def dump_table(buffer: StringIO, table: dict, key_parts: list[str]) -> StringIO:
-        """Iterate the tree, writing it, returns the buffer for convenience."""
-        for key, value in sorted(table.items(), key=order):
-            key_repr = (
-                repr(key)
-                # quote it, for valid value
-                if "." in key or key == ""
-                else key
-            )
-
-            if isinstance(value, dict):
-                # update global key
-                key_parts.append(key_repr)
-
-                # write table header
-                table_name = ".".join(key_parts)
-                if table_name:
-                    # newline before, for readability
-                    buffer.write(f"\n[{table_name}]\n")
-
-                # handle child
-                dump_table(buffer, value, key_parts)
-
-                # undo addition
-                key_parts.pop()
-
+    def length(key_value: tuple[Sized, object]) -> int:
+        """Dump shorter keys first."""
+        return len(key_value[0])
+
+    def quote(key: str) -> str:
+        """Quote a key if needed, for valid TOML."""
+        return repr(key) if "." in key or key == "" else key
+
+    def dump_value(value: object) -> str:
+        """Represent a value as TOML."""
+        # has to be before the fallback, str(True) is "True" which is not valid TOML
+        if isinstance(value, bool):
+            return "true" if value else "false"
+
+        if isinstance(value, str):
+            return repr(value)
+
+        # recurse, elements may need the special cases above too
+        if isinstance(value, list):
+            return "[" + ", ".join([dump_value(element) for element in value]) + "]"
+
+        return str(value)
+
+    def dump_table(chunks: list[str], table: dict, key_parts: list[str]) -> list[str]:
+        """Iterate the tree, collecting its lines, returns the list for convenience."""
+        # dump basic keys before nested tables, split them in a single pass
+        # rather than sorting everything with a key telling them apart
+        values = []
+        tables = []
+        for item in table.items():
+            if isinstance(item[1], dict):
+                tables.append(item)
             else:
-                value_repr = repr(value) if isinstance(value, str) else value
+                values.append(item)
+
+        values.sort(key=length)
+
+        for key, value in values:
+            chunks.append(f"{quote(key)} = {dump_value(value)}\n")
+
+        for key, value in tables:
+            # update global key
+            key_parts.append(quote(key))
+
+            # write table header
+            table_name = ".".join(key_parts)
+            if table_name:
+                # newline before, for readability
+                chunks.append(f"\n[{table_name}]\n")
+
+            # handle child
+            dump_table(chunks, value, key_parts)
 
-                buffer.write(f"{key_repr} = {value_repr}\n")
+            # undo addition
+            key_parts.pop()
 
-        return buffer
+        return chunks
 
-    # get going from base table
-    return dump_table(StringIO(), __data, []).getvalue()
+    # get going from base table, then join everything at once
+    return "".join(dump_table([], __data, []))
 
 
 def dump(__data: Dotty | dict, __file: TextIO) -> None: